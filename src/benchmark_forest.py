@@ -0,0 +1,114 @@
+import numpy as np
+import pandas as pd
+import joblib
+import os
+import tempfile
+import time
+from sklearn.ensemble import RandomForestRegressor
+from compiled_forest import CompiledForest
+
+def featurize_training_sample(n_samples, rng):
+    """Featurizes real formulas from data/train_data.csv the same way the engine does"""
+    from pymatgen.core import Composition
+
+    featurizer = joblib.load("models/magpie_featurizer.pkl")
+    formulas = pd.read_csv("data/train_data.csv")["formula"].dropna().astype(str)
+    formulas = formulas[~formulas.str.isnumeric()]
+    formulas = formulas.sample(n=min(n_samples, len(formulas)), random_state=int(rng.integers(1 << 31)))
+
+    comps = []
+    for f in formulas:
+        try:
+            comps.append(Composition(f))
+        except Exception:
+            pass
+    features = np.array(featurizer.featurize_many(comps, ignore_errors=True, pbar=False))
+    return np.nan_to_num(features)
+
+def threshold_range_sample(forest, n_samples, rng):
+    """Draws each feature uniformly across the range of its split thresholds,
+    so the inputs reach leaves all over the forest rather than a handful"""
+    is_split = np.isfinite(forest.threshold)
+    X = np.zeros((n_samples, forest.n_features))
+    for j in range(forest.n_features):
+        thresholds = forest.threshold[is_split & (forest.feature == j)]
+        if len(thresholds) == 0:
+            continue
+        low, high = thresholds.min(), thresholds.max()
+        margin = 0.05 * (high - low) + 1e-6
+        X[:, j] = rng.uniform(low - margin, high + margin, size=n_samples)
+    return X
+
+def benchmark_forest():
+    model_path = "models/rf_model.pkl"
+    BATCH_SIZE = 16  # One stoichiometry grid from the engine
+    REPEATS = 20
+    rng = np.random.default_rng(0)
+
+    # Use the real model if it exists, otherwise a stand-in forest on Magpie-sized features
+    use_real_model = os.path.exists(model_path)
+    if use_real_model:
+        print(f"Benchmarking {model_path}")
+    else:
+        print("models/rf_model.pkl not found, training a stand-in forest...")
+        # Magpie features sit far from zero; include some NaNs to exercise missing-value routing
+        X = rng.normal(50, 100, size=(5000, 132))
+        y = X[:, 0] - 0.01 * X[:, 1] ** 2 + rng.normal(scale=0.1, size=5000)
+        X[rng.random(X.shape) < 0.05] = np.nan
+        model = RandomForestRegressor(n_estimators=100, random_state=42, n_jobs=-1).fit(X, y)
+        model_path = os.path.join(tempfile.mkdtemp(), "rf_model.pkl")
+        joblib.dump(model, model_path)
+
+    compiled_path = os.path.join(tempfile.mkdtemp(), "rf_compiled")
+    CompiledForest.from_sklearn(joblib.load(model_path)).save(compiled_path)
+
+    # --- COLD START (load + first prediction) ---
+    # mmap defers reading the arrays to the first predict, so time both together.
+    # Both files were just written, so neither side pays for a truly cold disk read.
+    batch = threshold_range_sample(CompiledForest.load(compiled_path), BATCH_SIZE, rng)
+
+    start = time.perf_counter()
+    model = joblib.load(model_path)
+    sklearn_load = time.perf_counter() - start
+    model.predict(batch)
+    sklearn_cold = time.perf_counter() - start
+
+    start = time.perf_counter()
+    forest = CompiledForest.load(compiled_path)
+    compiled_load = time.perf_counter() - start
+    forest.predict(batch)
+    compiled_cold = time.perf_counter() - start
+
+    # --- PARITY ---
+    X_test = threshold_range_sample(forest, 2000, rng)
+    if use_real_model and os.path.exists("models/magpie_featurizer.pkl"):
+        X_test = np.vstack([featurize_training_sample(500, rng), X_test])
+    elif not use_real_model:
+        X_test[rng.random(X_test.shape) < 0.05] = np.nan
+
+    expected = model.predict(X_test)
+    actual = forest.predict(X_test)
+    max_diff = np.max(np.abs(expected - actual))
+    assert np.allclose(expected, actual, rtol=1e-9, atol=1e-9), f"Parity failed (max diff {max_diff})"
+    print(f"Parity OK on {len(X_test)} samples, {len(np.unique(expected))} distinct predictions "
+          f"(max abs diff {max_diff:.2e})")
+
+    # --- WARM LATENCY ---
+    start = time.perf_counter()
+    for _ in range(REPEATS):
+        model.predict(batch)
+    sklearn_latency = (time.perf_counter() - start) / REPEATS
+
+    start = time.perf_counter()
+    for _ in range(REPEATS):
+        forest.predict(batch)
+    compiled_latency = (time.perf_counter() - start) / REPEATS
+
+    print(f"--- RESULTS ({len(forest.roots)} trees, batch of {BATCH_SIZE}) ---")
+    print(f"Load only           sklearn: {sklearn_load * 1000:8.1f} ms   compiled: {compiled_load * 1000:8.1f} ms")
+    print(f"Load + 1st predict  sklearn: {sklearn_cold * 1000:8.1f} ms   compiled: {compiled_cold * 1000:8.1f} ms")
+    print(f"Warm predict        sklearn: {sklearn_latency * 1000:8.2f} ms   compiled: {compiled_latency * 1000:8.2f} ms")
+    print("-----------------------------")
+
+if __name__ == "__main__":
+    benchmark_forest()
@@ -0,0 +1,139 @@
+import numpy as np
+import joblib
+import json
+import os
+from sklearn.ensemble import ExtraTreesRegressor, RandomForestRegressor
+from sklearn.utils.validation import check_is_fitted
+
+# Flat-array version of a scikit-learn RandomForestRegressor (or ExtraTreesRegressor).
+# Every tree is packed into one set of node arrays so the whole forest can be
+# evaluated over a batch with NumPy, and saved as .npy files that load with mmap.
+
+ARRAY_NAMES = ["feature", "threshold", "left", "right", "missing_left", "value", "roots"]
+
+
+def source_fingerprint(model_path):
+    """Identifies a pickled model by path, mtime and size"""
+    stat = os.stat(model_path)
+    return {"path": model_path, "mtime_ns": stat.st_mtime_ns, "size": stat.st_size}
+
+
+class CompiledForest:
+    def __init__(self, feature, threshold, left, right, missing_left, value, roots, n_features, max_depth, source=None):
+        self.feature = feature      # (n_nodes,) split feature, 0 on leaves
+        self.threshold = threshold  # (n_nodes,) split threshold, +inf on leaves
+        self.left = left            # (n_nodes,) global index of left child, self on leaves
+        self.right = right          # (n_nodes,) global index of right child, self on leaves
+        self.missing_left = missing_left  # (n_nodes,) True if NaN goes to the left child
+        self.value = value          # (n_nodes, n_outputs) leaf predictions
+        self.roots = roots          # (n_trees,) global index of each tree's root
+        self.n_features = n_features
+        self.max_depth = max_depth
+        self.source = source  # fingerprint of the .pkl this was compiled from
+
+    @classmethod
+    def from_sklearn(cls, model):
+        """Packs the trees of a fitted RandomForest/ExtraTrees regressor into flat node arrays"""
+        if not isinstance(model, (RandomForestRegressor, ExtraTreesRegressor)):
+            raise TypeError("Only RandomForestRegressor and ExtraTreesRegressor models can be compiled")
+        check_is_fitted(model)
+
+        features, thresholds, lefts, rights, missing_lefts, values, roots = [], [], [], [], [], [], []
+        offset = 0
+        max_depth = 0
+        for estimator in model.estimators_:
+            tree = estimator.tree_
+            n = tree.node_count
+            is_leaf = tree.children_left == -1
+            node_ids = np.arange(offset, offset + n)
+
+            # Leaves point back at themselves, so every tree can be walked
+            # for the same number of steps without checking where it stopped
+            features.append(np.where(is_leaf, 0, tree.feature))
+            thresholds.append(np.where(is_leaf, np.inf, tree.threshold))
+            lefts.append(np.where(is_leaf, node_ids, tree.children_left + offset))
+            rights.append(np.where(is_leaf, node_ids, tree.children_right + offset))
+            # Forests trained on data with NaNs learn which side missing values go to
+            missing_lefts.append(tree.missing_go_to_left.astype(bool))
+            values.append(tree.value[:, :, 0])
+            roots.append(offset)
+
+            offset += n
+            max_depth = max(max_depth, tree.max_depth)
+
+        return cls(
+            feature=np.concatenate(features).astype(np.int32),
+            threshold=np.concatenate(thresholds).astype(np.float64),
+            left=np.concatenate(lefts).astype(np.int32),
+            right=np.concatenate(rights).astype(np.int32),
+            missing_left=np.concatenate(missing_lefts),
+            value=np.concatenate(values).astype(np.float64),
+            roots=np.array(roots, dtype=np.int32),
+            n_features=model.n_features_in_,
+            max_depth=max_depth,
+        )
+
+    def save(self, out_dir):
+        """Writes one .npy file per array plus a small meta.json"""
+        os.makedirs(out_dir, exist_ok=True)
+        for name in ARRAY_NAMES:
+            np.save(os.path.join(out_dir, f"{name}.npy"), getattr(self, name))
+        with open(os.path.join(out_dir, "meta.json"), "w") as f:
+            json.dump({"n_features": self.n_features, "max_depth": self.max_depth, "source": self.source}, f)
+
+    @classmethod
+    def load(cls, model_dir, mmap=True):
+        """Loads a compiled forest. With mmap=True the arrays are paged in lazily"""
+        mmap_mode = "r" if mmap else None
+        arrays = {
+            name: np.load(os.path.join(model_dir, f"{name}.npy"), mmap_mode=mmap_mode)
+            for name in ARRAY_NAMES
+        }
+        with open(os.path.join(model_dir, "meta.json")) as f:
+            meta = json.load(f)
+        return cls(**arrays, **meta)
+
+    def matches_source(self, model_path):
+        """False if model_path was changed (e.g. retrained) since this forest was compiled"""
+        if self.source is None:
+            return False
+        current = source_fingerprint(model_path)
+        return current["mtime_ns"] == self.source["mtime_ns"] and current["size"] == self.source["size"]
+
+    def predict(self, X):
+        """Same output as RandomForestRegressor.predict, for all trees at once"""
+        # sklearn compares float32 features against float64 thresholds
+        X = np.asarray(X, dtype=np.float32)
+        if X.ndim != 2 or X.shape[1] != self.n_features:
+            raise ValueError(f"Expected input of shape (n_samples, {self.n_features}), got {X.shape}")
+
+        n_samples = X.shape[0]
+        rows = np.arange(n_samples)
+
+        # One row per tree, one column per sample: current node of every walk
+        nodes = np.repeat(np.asarray(self.roots)[:, None], n_samples, axis=1)
+        for _ in range(self.max_depth):
+            x = X[rows, self.feature[nodes]]
+            go_left = np.where(np.isnan(x), self.missing_left[nodes], x <= self.threshold[nodes])
+            nodes = np.where(go_left, self.left[nodes], self.right[nodes])
+
+        # Average the leaf values over trees
+        leaf_values = self.value[nodes]  # (n_trees, n_samples, n_outputs)
+        pred = leaf_values.sum(axis=0) / len(self.roots)
+
+        if pred.shape[1] == 1:
+            return pred[:, 0]
+        return pred
+
+
+def compile_model(model_path="models/rf_model.pkl", out_dir="models/rf_compiled"):
+    print(f"Loading {model_path}...")
+    model = joblib.load(model_path)
+    forest = CompiledForest.from_sklearn(model)
+    forest.source = source_fingerprint(model_path)
+    forest.save(out_dir)
+    print(f"Compiled {len(forest.roots)} trees ({len(forest.feature)} nodes) to {out_dir}")
+
+
+if __name__ == "__main__":
+    compile_model()
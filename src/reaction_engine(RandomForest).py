@@ -4,6 +4,7 @@ from pymatgen.core import Composition
 from pymatgen.analysis.phase_diagram import PhaseDiagram, PDEntry
 import joblib
 import os
+from src.compiled_forest import CompiledForest
 
 class ReactionEngine:
     def __init__(self):
@@ -11,14 +12,31 @@ class ReactionEngine:
         
         # Paths to the files you downloaded from Colab
         model_path = "models/rf_model.pkl"
+        compiled_path = "models/rf_compiled"
         feat_path = "models/magpie_featurizer.pkl"
         
+        # Prefer the compiled forest (run `python src/compiled_forest.py` once):
+        # it mmap-loads in milliseconds instead of unpickling every tree
+        compiled = None
+        if os.path.isdir(compiled_path):
+            compiled = CompiledForest.load(compiled_path)
+            # Don't serve an old forest if rf_model.pkl was retrained after compiling
+            if os.path.exists(model_path) and not compiled.matches_source(model_path):
+                print(f"WARNING: {compiled_path} is out of date with {model_path}.")
+                print("Using the .pkl instead. Rerun `python src/compiled_forest.py` to recompile.")
+                compiled = None
+
         # Load the "Brain" and the "Translator" (Featurizer)
-        if os.path.exists(model_path) and os.path.exists(feat_path):
+        if compiled is not None and os.path.exists(feat_path):
+            self.model = compiled
+            self.featurizer = joblib.load(feat_path)
+            self.is_trained = True
+            print(f"Compiled Random Forest Loaded Successfully ({compiled_path}).")
+        elif os.path.exists(model_path) and os.path.exists(feat_path):
             self.model = joblib.load(model_path)
             self.featurizer = joblib.load(feat_path)
             self.is_trained = True
-            print("Random Forest Model Loaded Successfully.")
+            print(f"Random Forest Model Loaded Successfully ({model_path}).")
         else:
             print("WARNING: Models not found in 'models/' folder.")
             print("Please run the Colab script and move .pkl files here.")